@@ -11,6 +11,11 @@ from uvicorn import Config, Server
 
 from .hostutil import parse_endpoints
 
+try:
+    import uvloop
+except ImportError:  # Plain asyncio works fine, uvloop is just faster
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +30,11 @@ def run(
 ) -> None:
     """Run uvicorn server(s) for the given app.
 
+    Defaults backlog=4096, limit_concurrency=1000 and timeout_keep_alive=5 for
+    stable behavior under burst load; limit_concurrency sheds excess connections
+    cleanly instead of queuing them behind slow routes. Override via
+    **uvicorn_config if needed.
+
     Args:
         app: The ASGI application path (e.g., "myapp.main:app")
         listen: Endpoint string(s) (see parse_endpoint for formats).
@@ -45,12 +55,20 @@ def run(
         conf["proxy_headers"] = True
         conf["forwarded_allow_ips"] = proxy
     conf.update(uvicorn_config)
+    conf.setdefault("backlog", 4096)
+    conf.setdefault("limit_concurrency", 1000)
+    conf.setdefault("timeout_keep_alive", 5)
+
+    if uvloop is not None:
+        conf.setdefault("loop", "uvloop")
 
     with suppress(KeyboardInterrupt, asyncio.CancelledError):
         if reload or workers:
             serve_multiprocess(endpoints, **conf)
         else:
-            asyncio.run(serve(endpoints, **conf))
+            loop_factory = uvloop.new_event_loop if uvloop is not None else None
+            with asyncio.Runner(loop_factory=loop_factory) as runner:
+                runner.run(serve(endpoints, **conf))
 
 
 async def serve(endpoints: list[dict], **kwargs: Any) -> None:  # noqa: ANN401
@@ -61,12 +79,15 @@ async def serve(endpoints: list[dict], **kwargs: Any) -> None:  # noqa: ANN401
             "Options %s have no effect in simple mode (multiple endpoints)",
             ", ".join(sorted(forbidden)),
         )
-    await asyncio.gather(*(Server(Config(**kwargs, **ep)).serve() for ep in endpoints))
+    # TaskGroup cancels the remaining servers if any of them fails
+    async with asyncio.TaskGroup() as tg:
+        for ep in endpoints:
+            tg.create_task(Server(Config(**kwargs, **ep)).serve())
 
 
 def serve_multiprocess(endpoints: list[dict], **kwargs: Any) -> None:  # noqa: ANN401
     """Serve using uvicorn.run() for reload/workers support. Only first endpoint is used."""
-    if len(endpoints) > 1:
+    if len(endpoints) > 1 and logger.isEnabledFor(logging.WARNING):
         eps = [ep["uds"] if "uds" in ep else f"{ep['host']}:{ep['port']}" for ep in endpoints]
         logger.warning(
             "Current mode supports only one endpoint. Listening: %s, skipped: %s",
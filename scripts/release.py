@@ -1,8 +1,8 @@
 #!/usr/bin/env -S uv run
 """Build and release both fastapi-vue and fastapi-vue-setup packages."""
 
-import shutil
 import subprocess
+import sys
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -14,14 +14,31 @@ def main() -> None:
     """Build both packages to dist directory."""
     # Clear the dist directory
     if DIST.exists():
+        import shutil  # noqa: PLC0415
+
         shutil.rmtree(DIST)
     DIST.mkdir()
 
-    # Build fastapi-vue (subdirectory) to root dist
-    subprocess.run(["uv", "build", "--out-dir", str(DIST)], cwd=FASTAPI_VUE, check=True)  # noqa: S603, S607
-
-    # Build fastapi-vue-setup (root)
-    subprocess.run(["uv", "build", "--out-dir", str(DIST)], cwd=ROOT, check=True)  # noqa: S603, S607
+    # Build fastapi-vue (subdirectory) and fastapi-vue-setup (root) concurrently;
+    # the builds are independent and their artifact names never collide.
+    # Output is captured per build and printed afterwards so it doesn't interleave.
+    builds = [
+        subprocess.Popen(  # noqa: S603
+            ["uv", "build", "--out-dir", str(DIST)],  # noqa: S607
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        for cwd in (FASTAPI_VUE, ROOT)
+    ]
+    failed = False
+    for proc in builds:
+        output, _ = proc.communicate()
+        sys.stdout.write(output)
+        failed |= proc.returncode != 0
+    if failed:
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,18 @@
 # auto-upgrade@fastapi-vue-setup - remove this if you modify this file
 """Command-line entry point for running the backend server."""
 
-import argparse
 import os
 
-from fastapi_vue import server
-
 DEFAULT_PORT = TEMPLATE_DEFAULT_PORT
 DEVMODE = os.getenv("ENVPREFIX_DEV") == "1"
 
 
 def main() -> None:
     """Run the backend server with optional arguments."""
+    # Deferred: argparse and the uvicorn stack behind fastapi_vue.server
+    # dominate cold start, so --help and import of this module stay snappy
+    import argparse  # noqa: PLC0415
+
     parser = argparse.ArgumentParser(description="Run the MODULE_NAME server.")
     parser.add_argument(
         "-l",
@@ -20,6 +21,9 @@ def main() -> None:
         help=(f"Endpoint (default: localhost:{DEFAULT_PORT})."),
     )
     args = parser.parse_args()
+
+    from fastapi_vue import server  # noqa: PLC0415
+
     dev = {"reload": True, "reload_dirs": ["paskia"]} if DEVMODE else {}
     server.run(
         "APP_MODULE:APP_VAR",
@@ -9,12 +9,17 @@ import sys
 from contextlib import suppress
 from pathlib import Path
 
-# Import util.py from scripts/fastapi-vue (not a package, so we adjust sys.path)
-sys.path.insert(0, str(Path(__file__).with_name("fastapi-vue")))
-from devutil import (
+# Import util.py from scripts/fastapi-vue (not a package, so we adjust sys.path);
+# guarded so repeated execution cannot grow sys.path
+_SCRIPTS_DIR = str(Path(__file__).with_name("fastapi-vue"))
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
+from devutil import (  # noqa: E402
     ProcessGroup,
     check_ports_free,
+    install_needed,
     logger,
+    mark_installed,
     ready,
     setup_cli,
     setup_vite,
@@ -40,17 +45,30 @@ async def run_devserver(
     viteurl, npm_install, vite = setup_vite(listen, DEFAULT_VITE_PORT)
     backurl, MODULE_NAME = setup_cli("PROJECT_CLI", backend, DEFAULT_DEV_PORT)
 
-    # Tell the everyone by environment (vite proxy and backend devmode use these)
-    os.environ["ENVPREFIX_VITE_URL"] = viteurl
-    os.environ["ENVPREFIX_BACKEND_URL"] = backurl
-    os.environ["ENVPREFIX_DEV"] = "1"
+    # Tell the children by environment (vite proxy and backend devmode use
+    # these); built once and passed per spawn, the parent env stays untouched
+    env = {
+        **os.environ,
+        "ENVPREFIX_VITE_URL": viteurl,
+        "ENVPREFIX_BACKEND_URL": backurl,
+        "ENVPREFIX_DEV": "1",
+    }
 
     async with ProcessGroup() as pg:
-        npm_i = await pg.spawn(*npm_install, cwd=front)
+        # Warm start: skip the install when nothing changed since the last one
+        if installing := install_needed(front):
+            npm_i = await pg.spawn(*npm_install, cwd=front, env=env)
+        else:
+            logger.info("✓ Frontend dependencies up to date")
+            # A task, not a bare coroutine: if check_ports_free bails out
+            # below, a never-awaited coroutine would raise a RuntimeWarning
+            npm_i = asyncio.ensure_future(asyncio.sleep(0))
         await check_ports_free(viteurl, backurl)
-        await pg.spawn(*MODULE_NAME, *(extra_args or []))
+        await pg.spawn(*MODULE_NAME, *(extra_args or []), env=env)
         await pg.wait(npm_i, ready(backurl, path=HEALTH))
-        await pg.spawn(*vite, cwd=front)
+        if installing:
+            mark_installed(front)
+        await pg.spawn(*vite, cwd=front, env=env)
 
 
 def main() -> None:
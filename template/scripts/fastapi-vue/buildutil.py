@@ -1,6 +1,7 @@
 # ruff: noqa: INP001
 """Utilities used at build time and in devserver script. No dependencies."""
 
+import functools
 import logging
 import os
 import re
@@ -129,11 +130,16 @@ def _auto_detect_runtime(options: list[str]) -> tuple[str, str]:
     raise RuntimeError(msg)
 
 
+@functools.cache
 def find_js_runtime() -> tuple[str, str]:
     """Find a JavaScript runtime from JS_RUNTIME env or auto-detect.
 
     Returns (tool_path, tool_name) where tool_name is "deno", "npm", or "bun".
     Raises RuntimeError if no suitable runtime is found.
+
+    Cached: PATH and JS_RUNTIME don't change mid-run, so the which() walks and
+    node version probe happen once even when install/dev/build commands are all
+    requested.
     """
     options = ["npm", "deno", "bun"]
 
@@ -2,13 +2,16 @@
 """Utilities meant for devserver script, used only in source repository with dev deps."""
 
 import asyncio
+import os
+import signal
+import socket
 import subprocess
 import sys
 from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import urlsplit
 
-import httpx
 from buildutil import find_dev_tool, find_install_tool, logger
 from fastapi_vue.hostutil import parse_endpoint
 
@@ -22,21 +25,36 @@ class ProcessGroup:
     def __init__(self) -> None:
         """Initialize empty process tracking."""
         self._procs: list[asyncio.subprocess.Process] = []
-        self._cmds: dict[int, str] = {}  # pid -> command name
+        # Keyed by the Process object itself: pids can be recycled by the OS,
+        # a live Process handle cannot
+        self._cmds: dict[asyncio.subprocess.Process, str] = {}
 
     async def spawn(
         self,
         *cmd: str,
         cwd: str | None = None,
+        env: dict[str, str] | None = None,
     ) -> asyncio.subprocess.Process:
-        """Spawn a subprocess and track it."""
+        """Spawn a subprocess and track it. env replaces the inherited environment."""
         cmd_name = Path(cmd[0]).stem
         logger.info(">>> %s", " ".join([cmd_name, *cmd[1:]]))
-        proc = await asyncio.create_subprocess_exec(*cmd, cwd=cwd)
+        # Each child leads its own process group so cleanup can signal the
+        # whole tree (vite's esbuild workers, npm's script children) at once
+        kwargs: dict[str, Any] = {"process_group": 0} if sys.platform != "win32" else {}
+        proc = await asyncio.create_subprocess_exec(*cmd, cwd=cwd, env=env, **kwargs)
         self._procs.append(proc)
-        self._cmds[proc.pid] = cmd_name
+        self._cmds[proc] = cmd_name
         return proc
 
+    @staticmethod
+    def _signal(proc: asyncio.subprocess.Process, sig: signal.Signals) -> None:
+        """Signal a child's entire process group (plain terminate/kill on Windows)."""
+        with suppress(ProcessLookupError):
+            if sys.platform == "win32":
+                proc.kill() if sig == signal.SIGKILL else proc.terminate()
+            else:
+                os.killpg(proc.pid, sig)
+
     async def wait(
         self,
         *waitables: "asyncio.subprocess.Process | Coroutine[Any, Any, Any]",
@@ -46,7 +64,7 @@ class ProcessGroup:
         async def wait_proc(proc: asyncio.subprocess.Process) -> None:
             returncode = await proc.wait()
             if returncode != 0:
-                cmd_name = self._cmds.get(proc.pid, "unknown")
+                cmd_name = self._cmds.get(proc, "unknown")
                 raise subprocess.CalledProcessError(returncode, cmd_name)
 
         tasks = [
@@ -71,74 +89,132 @@ class ProcessGroup:
         if not running:
             return
 
+        # One waiter task per child, shared by both phases below
+        waiters = {p: asyncio.ensure_future(p.wait()) for p in running}
+
         if not immediate:
             # Wait for any one process to exit
             with suppress(asyncio.CancelledError):
-                await asyncio.wait(
-                    [asyncio.create_task(p.wait()) for p in running],
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
+                await asyncio.wait(waiters.values(), return_when=asyncio.FIRST_COMPLETED)
 
-        # Terminate remaining processes
-        for p in self._procs:
+        # Terminate remaining process trees
+        for p in running:
             if p.returncode is None:
-                with suppress(ProcessLookupError):
-                    p.terminate()
+                self._signal(p, signal.SIGTERM)
 
         # Wait for all to finish (with overall timeout), shielded from cancellation
-        still_running = [p for p in self._procs if p.returncode is None]
-        if still_running:
-            with suppress(asyncio.CancelledError):
-                try:
-                    await asyncio.shield(
-                        asyncio.wait_for(
-                            asyncio.gather(*[p.wait() for p in still_running]),
-                            timeout=10,
-                        ),
-                    )
-                except TimeoutError:
-                    for p in self._procs:
-                        if p.returncode is None:
-                            with suppress(ProcessLookupError):
-                                p.kill()
-                            await p.wait()
+        with suppress(asyncio.CancelledError):
+            try:
+                await asyncio.shield(
+                    asyncio.wait_for(asyncio.gather(*waiters.values()), timeout=10),
+                )
+            except TimeoutError:
+                # The timed-out gather cancelled the waiters; wait() is
+                # re-callable so the kill is still confirmed
+                for p in running:
+                    if p.returncode is None:
+                        self._signal(p, signal.SIGKILL)
+                        await p.wait()
 
 
 async def check_ports_free(*urls: str) -> None:
-    """Verify URLs are not responding (ports are free). Raise SystemExit if any respond."""
-
-    async def check(client: httpx.AsyncClient, url: str) -> None:
-        with suppress(httpx.RequestError):
-            res = await client.get(url, timeout=0.1)
-            server = res.headers.get("server", "server")
-            logger.warning("Conflicting %s already running at %s", server, url)
-            raise SystemExit(1)
+    """Verify the ports behind the URLs can be bound. Raise SystemExit if any are taken.
 
-    async with httpx.AsyncClient() as client:
-        await asyncio.gather(*[check(client, url) for url in urls])
-
-
-async def ready(url: str, path: str = "", max_attempts: int = 50) -> None:
+    A successful bind proves the port is free in microseconds (no connect
+    timeouts to sit through) and catches non-HTTP squatters too; on POSIX
+    SO_REUSEADDR keeps sockets lingering in TIME_WAIT from causing false alarms.
+    """
+    for url in urls:
+        parts = urlsplit(url)
+        try:
+            infos = socket.getaddrinfo(parts.hostname, parts.port, type=socket.SOCK_STREAM)
+        except OSError:
+            continue  # Unresolvable now; let the actual server report it
+        for family, kind, proto, _, addr in infos:
+            try:
+                with socket.socket(family, kind, proto) as sock:
+                    if sys.platform != "win32":
+                        # On Windows SO_REUSEADDR allows binding over an active
+                        # listener, which would defeat the check entirely
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    sock.bind(addr)
+            except OSError:
+                logger.warning("Port %d already in use at %s", parts.port, url)
+                raise SystemExit(1) from None
+
+
+async def _probe_http(host: str, port: int, request: bytes) -> bool:
+    """One HTTP/1.0 round-trip; True if anything answering HTTP is on the port."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), 1.0)
+    except (OSError, TimeoutError):
+        return False
+    try:
+        writer.write(request)
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), 1.0)
+    except (OSError, TimeoutError):
+        return False
+    finally:
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
+    return status_line.startswith(b"HTTP/")
+
+
+# ASYNC109: timeout here is a polling deadline with a custom exit (log +
+# SystemExit), not a cancellation scope that asyncio.timeout could replace
+async def ready(url: str, path: str = "", timeout: float = 10.0) -> None:  # noqa: ASYNC109
     """Wait for the server to be ready by polling an endpoint.
 
     Use empty path to disable the check and make this return immediately.
-    Raises SystemExit(1) if server doesn't start in time.
+    Polls a minimal HTTP/1.0 request over a raw connection (no HTTP client
+    stack to import or set up) with exponential backoff from 10ms to 200ms,
+    so a fast backend is detected within milliseconds while a slow one isn't
+    hammered. Raises SystemExit(1) if server doesn't start within the timeout.
     """
     if not path:
         return
 
-    async with httpx.AsyncClient() as client:
-        for attempt in range(max_attempts):
-            try:
-                await client.get(f"{url}{path}", timeout=1.0)
-            except httpx.RequestError:
-                if attempt == max_attempts - 1:
-                    logger.warning("Backend didn't start in time")
-                    raise SystemExit(1) from None
-                await asyncio.sleep(0.1)
-            else:
-                logger.info("✓ Backend ready!")
-                return
+    parts = urlsplit(url)
+    host, port = parts.hostname or "localhost", parts.port or 80
+    request = f"GET {path} HTTP/1.0\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.01
+    while not await _probe_http(host, port, request):
+        if loop.time() >= deadline:
+            logger.warning("Backend didn't start in time")
+            raise SystemExit(1)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 0.2)
+    logger.info("✓ Backend ready!")
+
+
+def install_needed(front: Path) -> bool:
+    """Check whether the frontend dependency install should run.
+
+    mark_installed stamps node_modules after a successful install; any later
+    edit to the manifest or a lockfile (whichever the runtime uses)
+    invalidates the stamp. Missing stamp or node_modules means install.
+    """
+    try:
+        stamp_mtime = (front / "node_modules" / ".install-stamp").stat().st_mtime_ns
+    except OSError:
+        return True
+    for name in ("package.json", "package-lock.json", "bun.lock", "bun.lockb", "deno.lock"):
+        try:
+            if (front / name).stat().st_mtime_ns >= stamp_mtime:
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def mark_installed(front: Path) -> None:
+    """Record a successful dependency install for install_needed."""
+    with suppress(OSError):
+        (front / "node_modules" / ".install-stamp").touch()
 
 
 def setup_vite(